@@ -1,15 +1,26 @@
 """Numpy uses OMP and BLAS for its linear algebra under the hood.
 
 Per default, both libraries use all cores on the machine. Since we are doing a pairwise
-comparison of all bootstrap/window replicates, for a substantial amount of time Pandora
-would require all cores on the machine, which is not an option when working on shared
-servers/clusters. Therefore, we set the OMP and BLAS threads manually to 1 to prevent
-this. Setting these variables needs to happen before the first import of numpy.
+comparison of all bootstrap/window replicates in parallel, every worker process would
+require all cores on the machine, which is not an option when working on shared
+servers/clusters. Therefore, we limit the OMP and BLAS threads to 1 in the worker
+processes and while comparing the replicates, but not globally. This way, the single
+embedding of the full input dataset can still make use of multi-threaded BLAS.
 """
 import os
 
-os.environ["OMP_NUM_THREADS"] = "1"
-os.environ["OPENBLAS_NUM_THREADS"] = "1"
+from threadpoolctl import threadpool_limits
+
+
+def _limit_worker_threads():
+    """Limits the number of OMP and BLAS threads of the calling process to 1.
+
+    The environment variables are respected by numpy if it was not imported yet and are inherited by subprocesses
+    (e.g. smartpca), ``threadpoolctl`` limits the BLAS and OMP libraries that are already loaded.
+    """
+    os.environ["OMP_NUM_THREADS"] = "1"
+    os.environ["OPENBLAS_NUM_THREADS"] = "1"
+    threadpool_limits(limits=1)
 
 
 # Fix a race condition in the internal ``multiprocessing.process`` cleanup logic that could manifest as an unintended
@@ -17,6 +17,7 @@ import loguru
 import pandas as pd
 from numpy import typing as npt
 
+from pandora import _limit_worker_threads
 from pandora.custom_errors import PandoraException
 from pandora.custom_types import EmbeddingAlgorithm, Executable
 from pandora.dataset import EigenDataset, NumpyDataset, _smartpca_finished
@@ -89,6 +90,8 @@ def _wrapped_func(func, args, tmpfile):
     Queue object only allows for a limited number of bytes to be written before being consumed. However, for our
     use case of bootstrap datasets with associated embeddings, this limit was reached even for small datasets.
     """
+    # bootstraps are computed in parallel, so each process should only use a single OMP/BLAS thread
+    _limit_worker_threads()
     try:
         result = func(*args)
     except Exception as e:
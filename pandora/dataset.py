@@ -20,7 +20,12 @@ from sklearn.decomposition import PCA as sklearnPCA
 from pandora.custom_errors import PandoraConfigException, PandoraException
 from pandora.custom_types import Executable
 from pandora.distance_metrics import euclidean_sample_distance
-from pandora.embedding import Embedding, from_smartpca, mds_from_dataframe
+from pandora.embedding import (
+    Embedding,
+    _embedding_columns,
+    from_smartpca,
+    mds_from_dataframe,
+)
 from pandora.imputation import impute_data
 
 
@@ -494,12 +499,9 @@ class EigenDataset:
             # no samples are projected
             return pd.Series(dtype=object)
 
-        projected = []
-        for sample_id, population in zip(self.sample_ids, self.populations):
-            if population not in populations_for_embedding.values:
-                projected.append(sample_id)
-
-        return pd.Series(projected)
+        # all samples with a population not used for computing the embedding are projected
+        is_projected = ~self.populations.isin(populations_for_embedding).values
+        return pd.Series(self.sample_ids.values[is_projected])
 
     def get_sequence_length(self) -> int:
         """Counts and returns the number of SNPs in ``self._geno_file``.
@@ -806,7 +808,7 @@ class EigenDataset:
         embedding, explained_variance = pcoa(fst_matrix)
         embedding = pd.DataFrame(
             data=embedding[:, :n_components],
-            columns=[f"D{i}" for i in range(n_components)],
+            columns=list(_embedding_columns(n_components)),
         )
         embedding["population"] = populations.values
 
@@ -1152,7 +1154,7 @@ class NumpyDataset:
         pca = sklearnPCA(n_components, random_state=42)
         embedding = pca.fit_transform(pca_input)
         embedding = pd.DataFrame(
-            data=embedding, columns=[f"D{i}" for i in range(n_components)]
+            data=embedding, columns=list(_embedding_columns(n_components))
         )
         embedding["sample_id"] = self.sample_ids.values
         embedding["population"] = self.populations.values
@@ -1226,7 +1228,7 @@ class NumpyDataset:
         embedding, explained_variance = pcoa(distance_matrix)
         embedding = pd.DataFrame(
             data=embedding[:, :n_components],
-            columns=[f"D{i}" for i in range(n_components)],
+            columns=list(_embedding_columns(n_components)),
         )
         embedding["population"] = populations.values
 
@@ -1252,12 +1254,9 @@ class NumpyDataset:
         NumpyDataset
             A new dataset object containing the bootstrapped ``input_data``.
         """
-        if seed is not None:
-            random.seed(seed)
         num_snps = self.input_data.shape[1]
-        bootstrap_data = self.input_data[
-            :, np.random.choice(range(num_snps), size=num_snps)
-        ]
+        rng = np.random.default_rng(seed)
+        bootstrap_data = self.input_data[:, rng.integers(num_snps, size=num_snps)]
         return NumpyDataset(bootstrap_data, self.sample_ids, self.populations)
 
     def get_windows(self, n_windows: int = 100) -> List[NumpyDataset]:
@@ -1,17 +1,47 @@
+import functools
 import math
 import pathlib
-from typing import Tuple
+from typing import FrozenSet, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from numpy import typing as npt
 from sklearn.cluster import KMeans
 from sklearn.mixture import GaussianMixture
-from sklearn.model_selection import GridSearchCV
 
 from pandora.custom_errors import PandoraException
 
 
+def _gmm_bic(embedding_matrix: npt.NDArray[float], n_components: int) -> float:
+    gmm = GaussianMixture(n_components=n_components, random_state=42)
+    gmm.fit(embedding_matrix)
+    return gmm.bic(embedding_matrix)
+
+
+def _check_explained_variances(
+    explained_variances: npt.NDArray[float], n_components: int
+) -> None:
+    if explained_variances.ndim != 1:
+        raise PandoraException(
+            f"Explained variance should be a 1D numpy array. "
+            f"Instead got {explained_variances.ndim} dimensions."
+        )
+    if explained_variances.shape[0] != n_components:
+        raise PandoraException(
+            f"Explained variance required for each PC. Got {n_components} but {len(explained_variances)} variances."
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def _embedding_columns(n_components: int) -> Tuple[str, ...]:
+    """Returns the names of the embedding vector columns ``D0, ..., D{n_components - 1}``.
+
+    Memoized as they are required for every Embedding that is constructed.
+    """
+    return tuple(f"D{i}" for i in range(n_components))
+
+
 class Embedding:
     """Class structure encapsulating PCA or MDS results.
 
@@ -51,6 +81,8 @@ class Embedding:
         Pandas series containing the IDs of all samples.
     populations : pd.Series[str]
         Pandas series containing the population for each sample in ``sample_ids``.
+    sample_id_set : FrozenSet[str]
+        Set of all sample IDs. Computed on first access.
 
     Raises
     ------
@@ -67,15 +99,7 @@ class Embedding:
         n_components: int,
         explained_variances: npt.NDArray[float],
     ):
-        if explained_variances.ndim != 1:
-            raise PandoraException(
-                f"Explained variance should be a 1D numpy array. "
-                f"Instead got {explained_variances.ndim} dimensions."
-            )
-        if explained_variances.shape[0] != n_components:
-            raise PandoraException(
-                f"Explained variance required for each PC. Got {n_components} but {len(explained_variances)} variances."
-            )
+        _check_explained_variances(explained_variances, n_components)
 
         if "sample_id" not in embedding.columns:
             raise PandoraException("Column `sample_id` required.")
@@ -89,8 +113,9 @@ class Embedding:
                 f"One data column required for each PC. Got {n_components} but {embedding.shape[1] - 2} PC columns."
             )
 
-        embedding_columns = [f"D{i}" for i in range(n_components)]
-        if not all(c in embedding.columns for c in embedding_columns):
+        embedding_columns = list(_embedding_columns(n_components))
+        missing_columns = set(embedding_columns).difference(embedding.columns)
+        if missing_columns:
             raise PandoraException(
                 f"Expected all of the following columns to be present in embedding: {embedding_columns}."
                 f"Instead got {[c for c in embedding.columns if c not in ['sample_id', 'population']]}"
@@ -104,17 +129,146 @@ class Embedding:
         self.sample_ids = self.embedding.sample_id
         self.populations = self.embedding.population
 
+    @classmethod
+    def from_ndarray(
+        cls,
+        embedding_matrix: npt.NDArray[float],
+        sample_ids: pd.Series,
+        populations: pd.Series,
+        explained_variances: npt.NDArray[float],
+    ) -> "Embedding":
+        """Creates an Embedding directly from an embedding matrix and the corresponding sample IDs and populations.
+
+        In contrast to initializing an Embedding with a dataframe, the ``embedding`` dataframe is only constructed
+        on first access. Use this if the embedding data is already available as numpy array, e.g. after transforming
+        the embedding matrix of an existing Embedding. If ``sample_ids`` is not sorted, all data is sorted by sample ID.
+
+        Parameters
+        ----------
+        embedding_matrix : npt.NDArray[float]
+            Numpy ndarray of shape ``(n_samples, n_components)`` containing the embedding matrix.
+        sample_ids : pd.Series[str]
+            Pandas series containing the IDs of all samples, in the same order as the rows of ``embedding_matrix``.
+        populations : pd.Series[str]
+            Pandas series containing the population for each sample in ``sample_ids``.
+        explained_variances : npt.NDArray[float]
+            Numpy ndarray containing the explained variances for each embedding vector (``shape=(n_components,)``)
+
+        Returns
+        -------
+        Embedding
+            Embedding object containing the passed data.
+
+        Raises
+        ------
+        PandoraException
+            - If ``embedding_matrix`` is not two dimensional.
+            - If the number of sample IDs or populations does not match the number of rows of ``embedding_matrix``.
+            - If ``explained_variances`` is not a 1D numpy array or contains more/fewer values than ``n_components``.
+        """
+        if embedding_matrix.ndim != 2:
+            raise PandoraException(
+                f"Numpy embedding matrix must be two dimensional. Passed data has {embedding_matrix.ndim} dimensions."
+            )
+        n_samples, n_components = embedding_matrix.shape
+        _check_explained_variances(explained_variances, n_components)
+
+        if sample_ids.shape[0] != n_samples:
+            raise PandoraException(
+                f"One sample ID required for each sample. Got {len(sample_ids)} IDs, "
+                f"but embedding_matrix has {n_samples} samples."
+            )
+        if populations.shape[0] != n_samples:
+            raise PandoraException(
+                f"One population required for each sample. Got {len(populations)} populations, "
+                f"but embedding_matrix has {n_samples} samples."
+            )
+
+        sample_ids = sample_ids.to_numpy()
+        populations = populations.to_numpy()
+        if not pd.Index(sample_ids).is_monotonic_increasing:
+            order = np.argsort(sample_ids, kind="stable")
+            embedding_matrix = embedding_matrix[order]
+            sample_ids = sample_ids[order]
+            populations = populations[order]
+
+        embedding = cls.__new__(cls)
+        embedding.n_components = n_components
+        embedding.explained_variances = explained_variances
+        embedding.embedding_matrix = np.ascontiguousarray(
+            embedding_matrix, dtype=np.float64
+        )
+        embedding.sample_ids = pd.Series(sample_ids, name="sample_id")
+        embedding.populations = pd.Series(populations, name="population")
+        return embedding
+
+    @functools.cached_property
+    def embedding(self) -> pd.DataFrame:
+        """Returns the embedding data as pandas dataframe.
+
+        For Embeddings created via ``from_ndarray``, the dataframe is constructed from ``self.embedding_matrix``,
+        ``self.sample_ids`` and ``self.populations`` on first access and cached afterwards.
+        When initializing an Embedding with a dataframe, the (sorted) dataframe is set directly.
+
+        Returns
+        -------
+        pd.DataFrame
+            Pandas dataframe with shape ``(n_samples, n_components + 2)`` containing one row per sample and
+            the columns ``D{i} for i in range(n_components)``, ``sample_id``, and ``population``.
+        """
+        embedding_data = {
+            column: self.embedding_matrix[:, i]
+            for i, column in enumerate(_embedding_columns(self.n_components))
+        }
+        embedding_data["sample_id"] = self.sample_ids.values
+        embedding_data["population"] = self.populations.values
+        return pd.DataFrame(embedding_data)
+
+    @functools.cached_property
+    def sample_id_set(self) -> FrozenSet[str]:
+        """Returns the set of all sample IDs of this Embedding.
+
+        The set is computed on first access and cached for subsequent (set-based) sample ID comparisons.
+
+        Returns
+        -------
+        FrozenSet[str]
+            Frozenset containing all IDs in ``self.sample_ids``.
+        """
+        return frozenset(self.sample_ids.values)
+
+    @functools.cached_property
+    def _centered_normalized(self) -> npt.NDArray[float]:
+        """Returns the embedding matrix centered at the origin and scaled to unit Frobenius norm.
+
+        This is identical to the standardization done in scipy's Procrustes Analysis. Computed on first access and
+        reused in all subsequent comparisons.
+        """
+        centered = self.embedding_matrix - self.embedding_matrix.mean(axis=0)
+        norm = np.linalg.norm(centered)
+        if norm == 0:
+            raise ValueError("Input matrices must contain >1 unique points")
+        return centered / norm
+
     def _get_embedding_numpy_array(self) -> np.ndarray:
         """Converts the embedding data to a numpy array.
 
         Returns
         -------
          np.ndarray
-            Array of shape ``(n_samples, self.n_components)``. Does not contain the sample IDs or populations.
+            C-contiguous float64 array of shape ``(n_samples, self.n_components)``.
+            Does not contain the sample IDs or populations.
         """
-        return self.embedding[[f"D{i}" for i in range(self.n_components)]].to_numpy()
+        # scikit-learn (KMeans, GaussianMixture) copies non C-contiguous input in every fit, so we convert the data
+        # once here instead of in each of the repeated clustering calls
+        return np.ascontiguousarray(
+            self.embedding[list(_embedding_columns(self.n_components))].to_numpy(),
+            dtype=np.float64,
+        )
 
-    def get_optimal_kmeans_k(self, k_boundaries: Tuple[int, int] = None) -> int:
+    def get_optimal_kmeans_k(
+        self, k_boundaries: Tuple[int, int] = None, threads: Optional[int] = None
+    ) -> int:
         """Determines the optimal number of clusters k for K-Means clustering according to the Bayesian Information
         Criterion (BIC).
 
@@ -126,32 +280,42 @@ class Embedding:
             If ``self.embedding.populations`` is not identical for all samples, use the number of distinct populations,
             otherwise use the square root of the number of samples as maximum ``max_k``.
             The minimum ``min_k`` is ``min(max_k, 3)``.
+        threads : int, default=None
+            Number of threads to use for fitting the Gaussian Mixture Models of the different k in parallel.
+            Default is to fit them sequentially.
 
         Returns
         -------
         int
             the optimal number of clusters between ``min_n`` and ``max_n``
+
+        Raises
+        ------
+        PandoraException
+            If the range of k between ``min_k`` (inclusive) and ``max_k`` (exclusive) contains no candidates.
         """
         if k_boundaries is None:
             # check whether there are distinct populations given
-            n_populations = self.embedding.population.nunique()
+            n_populations = self.populations.nunique()
             if n_populations > 1:
                 max_k = n_populations
             else:
                 # if only one population: use the square root of the number of samples
-                max_k = int(math.sqrt(self.embedding.shape[0]))
+                max_k = int(math.sqrt(self.embedding_matrix.shape[0]))
             min_k = min(3, max_k)
         else:
             min_k, max_k = k_boundaries
 
-        grid_search = GridSearchCV(
-            estimator=GaussianMixture(),
-            param_grid={"n_components": range(min_k, max_k)},
-            scoring=lambda estimator, X: -estimator.bic(X),
+        # BIC already penalizes the model complexity, so we fit each GMM once on all samples instead of cross-validating
+        k_candidates = range(min_k, max_k)
+        if len(k_candidates) == 0:
+            raise PandoraException(
+                f"Cannot determine the optimal number of clusters: the range of k [{min_k}, {max_k}) is empty."
+            )
+        bics = Parallel(n_jobs=threads)(
+            delayed(_gmm_bic)(self.embedding_matrix, k) for k in k_candidates
         )
-
-        grid_search.fit(self.embedding_matrix)
-        return grid_search.best_params_["n_components"]
+        return k_candidates[int(np.argmin(bics))]
 
     def cluster(self, kmeans_k: int = None) -> KMeans:
         """Fits a K-Means cluster to the embedding data and returns a scikit-learn fitted KMeans object.
@@ -173,6 +337,82 @@ class Embedding:
         return kmeans
 
 
+def _read_smartpca_evec(evec: pathlib.Path) -> pd.DataFrame:
+    """Reads the sample data of a smartpca ``.evec`` result file and checks it for correctness.
+
+    Returns a dataframe with one row per sample and the columns sample ID, one column per PC, and population.
+    Raises a PandoraException if the file is incorrect.
+    """
+    error_message = f"SmartPCA evec result file appears to be incorrect: {evec}"
+
+    # first line should start with #eigvals: and then determines the number of PCs
+    with evec.open() as f:
+        line = f.readline().strip()
+        if not line.startswith("#eigvals"):
+            raise PandoraException(error_message)
+
+        variances = line.split()[1:]
+        try:
+            [float(v) for v in variances]
+        except ValueError:
+            raise PandoraException(error_message)
+        n_pcs = len(variances)
+
+        # all following lines should look like this:
+        # SampleID  PC0  PC1  ...  PCN-1  Population
+        # lines with too many values cause a ParserError, lines with too few values and blank lines result in NaN values
+        # only empty fields are NaN, sample IDs or populations like "NA" or "None" are valid labels
+        try:
+            evec_data = pd.read_csv(
+                f,
+                sep=r"\s+",
+                header=None,
+                keep_default_na=False,
+                na_values=[""],
+                skip_blank_lines=False,
+            )
+        except (pd.errors.ParserError, pd.errors.EmptyDataError):
+            raise PandoraException(error_message)
+
+    # short rows leave the population NaN, blank lines leave all values NaN
+    missing_labels = evec_data.iloc[:, [0, -1]].isna().any(axis=None)
+    if evec_data.shape[1] != n_pcs + 2 or missing_labels:
+        raise PandoraException(error_message)
+
+    # all PC values should be floats
+    for column in evec_data.columns[1:-1]:
+        dtype = evec_data[column].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            # pandas parses True/False as booleans, which float() rejects
+            raise PandoraException(error_message)
+        if not (isinstance(dtype, np.dtype) and np.issubdtype(dtype, np.number)):
+            # the C parser does not parse values like "nan" or "infinity" as floats, so we fall back to float()
+            try:
+                evec_data[column] = np.fromiter(
+                    map(float, evec_data[column]),
+                    dtype=np.float64,
+                    count=evec_data.shape[0],
+                )
+            except ValueError:
+                raise PandoraException(error_message)
+
+    return evec_data
+
+
+def _read_smartpca_eval(eval: pathlib.Path) -> npt.NDArray[float]:
+    """Reads the eigenvalues of a smartpca ``.eval`` result file, each line should contain a single float only.
+
+    Raises a PandoraException if the file is incorrect.
+    """
+    error_message = f"SmartPCA eval result file appears to be incorrect: {eval}"
+    lines = eval.read_text().splitlines()
+    try:
+        # float() rejects blank lines and lines with more than one value
+        return np.fromiter(map(float, lines), dtype=np.float64, count=len(lines))
+    except ValueError:
+        raise PandoraException(error_message)
+
+
 def check_smartpca_results(evec: pathlib.Path, eval: pathlib.Path) -> None:
     """Checks whether the smartpca results finished properly and contain all required information.
 
@@ -192,50 +432,8 @@ def check_smartpca_results(evec: pathlib.Path, eval: pathlib.Path) -> None:
     PandoraException
         If either the ``evec`` file or the ``eval`` file are incorrect.
     """
-    # check the evec file:
-    # - first line should start with #eigvals: and then determines the number of PCs
-    with evec.open() as f:
-        line = f.readline().strip()
-        if not line.startswith("#eigvals"):
-            raise PandoraException(
-                f"SmartPCA evec result file appears to be incorrect: {evec}"
-            )
-
-        variances = line.split()[1:]
-        try:
-            [float(v) for v in variances]
-        except ValueError:
-            raise PandoraException(
-                f"SmartPCA evec result file appears to be incorrect: {evec}"
-            )
-        n_pcs = len(variances)
-
-        # all following lines should look like this:
-        # SampleID  PC0  PC1  ...  PCN-1  Population
-        for line in f.readlines():
-            values = line.strip().split()
-            if len(values) != n_pcs + 2:
-                raise PandoraException(
-                    f"SmartPCA evec result file appears to be incorrect: {evec}"
-                )
-
-            # all PC values should be floats
-            try:
-                [float(v) for v in values[1:-1]]
-            except ValueError:
-                raise PandoraException(
-                    f"SmartPCA evec result file appears to be incorrect: {evec}"
-                )
-
-    # check the eval file: each line should contain a single float only
-    for line in eval.open():
-        line = line.strip()
-        try:
-            float(line)
-        except ValueError:
-            raise PandoraException(
-                f"SmartPCA eval result file appears to be incorrect: {eval}"
-            )
+    _read_smartpca_evec(evec)
+    _read_smartpca_eval(eval)
 
 
 def from_smartpca(evec: pathlib.Path, eval: pathlib.Path) -> Embedding:
@@ -258,26 +456,20 @@ def from_smartpca(evec: pathlib.Path, eval: pathlib.Path) -> Embedding:
     PandoraException
         If either the ``evec`` file or the ``eval`` file are incorrect.
     """
-    # make sure both files are in correct file_format
-    check_smartpca_results(evec, eval)
     # First, read the eigenvectors and transform it into the pca_data pandas dataframe
-    with open(evec) as f:
-        # first line does not contain data we are interested in
-        f.readline()
-        pca_data = pd.read_table(f, delimiter=" ", skipinitialspace=True, header=None)
+    # reading the files also makes sure both files are in correct file_format
+    pca_data = _read_smartpca_evec(evec)
+    eigenvalues = _read_smartpca_eval(eval)
 
     n_pcs = pca_data.shape[1] - 2
 
-    cols = ["sample_id", *[f"D{i}" for i in range(n_pcs)], "population"]
+    cols = ["sample_id", *_embedding_columns(n_pcs), "population"]
     pca_data = pca_data.rename(columns=dict(zip(pca_data.columns, cols)))
     pca_data = pca_data.sort_values(by="sample_id").reset_index(drop=True)
 
-    # next, read the eigenvalues and compute the explained variances for all n_components principal components
-    eigenvalues = open(eval).readlines()
-    eigenvalues = [float(ev) for ev in eigenvalues]
-    explained_variances = [ev / sum(eigenvalues) for ev in eigenvalues]
+    # next, compute the explained variances for all n_components principal components
     # keep only the first n_components explained variances
-    explained_variances = np.asarray(explained_variances[:n_pcs])
+    explained_variances = eigenvalues[:n_pcs] / eigenvalues.sum()
 
     return Embedding(
         embedding=pca_data, n_components=n_pcs, explained_variances=explained_variances
@@ -364,7 +556,7 @@ def mds_from_dataframe(
             data=mds_data,
             columns=[
                 "sample_id",
-                *[f"D{i}" for i in range(n_components)],
+                *_embedding_columns(n_components),
                 "population",
             ],
         )
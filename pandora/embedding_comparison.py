@@ -5,41 +5,48 @@ from __future__ import (  # allows type hint EmbeddingComparison inside Embeddin
 import concurrent.futures
 import itertools
 import multiprocessing
+import os
 import warnings
 from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from numpy import typing as npt
-from scipy.spatial import procrustes
 from sklearn.metrics import fowlkes_mallows_score
 from sklearn.preprocessing import normalize
+from threadpoolctl import threadpool_limits
 
+from pandora import _limit_worker_threads
 from pandora.custom_errors import PandoraException
-from pandora.embedding import Embedding
+from pandora.embedding import Embedding, _embedding_columns
 
 
-def _filter_samples(embedding: Embedding, samples_to_keep: List[str]) -> Embedding:
-    """Filters the given Embedding object by removing all samples not contained in samples_to_keep.
+def _filter_samples(
+    embedding: Embedding, sample_indices: npt.NDArray[int]
+) -> Embedding:
+    """Filters the given Embedding object by removing all samples not contained in sample_indices.
 
     Parameters
     ----------
     embedding : Embedding
         Embedding object to filter.
-    samples_to_keep : List[str]
-        List of sample IDs to keep.
+    sample_indices : npt.NDArray[int]
+        Sorted positions of the samples to keep in ``embedding.sample_ids``.
 
     Returns
     -------
     Embedding
-        new Embedding object containing the data of embedding for all samples in ``samples_to_keep``
+        new Embedding object containing the data of embedding for all samples in ``sample_indices``.
+        If all samples of embedding are kept, the passed embedding is returned.
     """
-    embedding_data = embedding.embedding
-    embedding_data = embedding_data.loc[embedding_data.sample_id.isin(samples_to_keep)]
+    if sample_indices.shape[0] == embedding.sample_ids.shape[0]:
+        # nothing to remove, no need to construct a new (identical) Embedding object
+        return embedding
 
-    return Embedding(
-        embedding=embedding_data,
-        n_components=embedding.n_components,
+    return Embedding.from_ndarray(
+        embedding_matrix=embedding.embedding_matrix[sample_indices],
+        sample_ids=embedding.sample_ids.iloc[sample_indices],
+        populations=embedding.populations.iloc[sample_indices],
         explained_variances=embedding.explained_variances,
     )
 
@@ -66,8 +73,8 @@ def _check_sample_clipping(
     UserWarning
         If more than 20% of samples were removed for the comparison. This typically indicates a large number of outliers.
     """
-    n_samples_before = before_clipping.embedding.shape[0]
-    n_samples_after = after_clipping.embedding.shape[0]
+    n_samples_before = before_clipping.embedding_matrix.shape[0]
+    n_samples_after = after_clipping.embedding_matrix.shape[0]
 
     if n_samples_after <= 0.8 * n_samples_before:
         warnings.warn(
@@ -97,16 +104,27 @@ def _clip_missing_samples_for_comparison(
     reference : Embedding
         Passed ``reference`` Embedding, but only containing the samples present in both Embeddings (``comparable``, ``reference``).
     """
-    comp_data = comparable.embedding
-    ref_data = reference.embedding
-
-    comp_ids = set(comp_data.sample_id)
-    ref_ids = set(ref_data.sample_id)
-
-    shared_samples = sorted(comp_ids.intersection(ref_ids))
+    if np.array_equal(comparable.sample_ids.values, reference.sample_ids.values):
+        # both Embeddings already contain exactly the same samples, nothing to clip
+        return comparable, reference
+
+    # the sample IDs of an Embedding are sorted, so the positions of the shared samples are sorted as well and the
+    # clipped Embeddings keep the order of samples
+    # sample IDs are not required to be unique, so we keep all rows of a shared sample ID (and not only the first one)
+    # note that np.intersect1d(..., return_indices=True) returns only the first position of each shared sample ID, so
+    # we select the positions with np.isin instead
+    shared_samples = np.intersect1d(
+        comparable.sample_ids.values, reference.sample_ids.values
+    )
+    comparable_indices = np.flatnonzero(
+        np.isin(comparable.sample_ids.values, shared_samples)
+    )
+    reference_indices = np.flatnonzero(
+        np.isin(reference.sample_ids.values, shared_samples)
+    )
 
-    comparable_clipped = _filter_samples(comparable, shared_samples)
-    reference_clipped = _filter_samples(reference, shared_samples)
+    comparable_clipped = _filter_samples(comparable, comparable_indices)
+    reference_clipped = _filter_samples(reference, reference_indices)
 
     assert (
         comparable_clipped.embedding_matrix.shape
@@ -149,35 +167,179 @@ def _pad_missing_samples(all_sample_ids: pd.Series, embedding: Embedding) -> Emb
     )
 
 
+def _have_identical_samples(embeddings: List[Embedding]) -> bool:
+    """Checks whether all embeddings contain the same samples and the same number of components."""
+    reference = embeddings[0]
+    return all(
+        embedding.embedding_matrix.shape == reference.embedding_matrix.shape
+        and np.array_equal(embedding.sample_ids.values, reference.sample_ids.values)
+        for embedding in embeddings
+    )
+
+
+def _procrustes(
+    reference: Embedding, comparable: Embedding
+) -> Tuple[npt.NDArray[float], npt.NDArray[float], float]:
+    r"""Performs a Procrustes Analysis of ``reference`` and ``comparable``.
+
+    Equivalent to ``scipy.spatial.procrustes(reference.embedding_matrix, comparable.embedding_matrix)``.
+
+    Uses the cached standardized embedding matrices of both Embeddings, so repeatedly comparing the same Embedding
+    (e.g. all pairs of bootstrap replicates) centers and scales its data only once.
+
+    Since both standardized matrices have unit Frobenius norm, the disparity :math:`\sum (A - sBR)^2` equals
+    :math:`1 - s^2` with :math:`s` being the sum of the singular values of :math:`A^T B`. This is the same quantity
+    used in ``_pairwise_stabilities_for_identical_samples``, and saves one pass over both matrices. Due to rounding,
+    :math:`s` can be marginally larger than 1 for (almost) identical matrices, so the disparity is clamped at 0.
+    """
+    standardized_reference = reference._centered_normalized
+    standardized_comparable = comparable._centered_normalized
+
+    u, s, vt = np.linalg.svd(
+        standardized_reference.T @ standardized_comparable, full_matrices=False
+    )
+    scale = s.sum()
+    transformed_comparable = standardized_comparable @ (u @ vt).T
+    transformed_comparable *= scale
+    disparity = max(0.0, 1.0 - scale**2)
+
+    return standardized_reference, transformed_comparable, disparity
+
+
+def _pairwise_stabilities_for_identical_samples(
+    embeddings: List[Embedding],
+) -> pd.Series:
+    r"""Computes the Pandora stability for all unique pairs of embeddings at once.
+
+    Requires all embeddings to contain the same samples (see ``_have_identical_samples``).
+
+    For two standardized matrices :math:`A` and :math:`B`, the Procrustes disparity is :math:`1 - s^2` with :math:`s`
+    being the sum of the singular values of :math:`A^T B`. The Pandora stability :math:`\sqrt{1 - disparity}` is thus
+    :math:`s`, capped at 1 like the clamped disparity in ``_procrustes``. The cross-products :math:`A^T B` are computed
+    block-wise: for each embedding, one matrix multiplication with all subsequent embeddings, which keeps the memory
+    footprint linear in the number of embeddings. As a single large matrix product, it makes good use of multithreaded
+    BLAS.
+    """
+    n_embeddings = len(embeddings)
+    n_components = embeddings[0].n_components
+    # shape (n_samples, n_embeddings * n_components), the standardized embedding matrices side by side
+    standardized = np.concatenate([e._centered_normalized for e in embeddings], axis=1)
+
+    stabilities = []
+    for i in range(n_embeddings - 1):
+        reference = standardized[:, i * n_components : (i + 1) * n_components]
+        cross_products = reference.T @ standardized[:, (i + 1) * n_components :]
+        # shape (n_embeddings - i - 1, n_components, n_components)
+        cross_products = cross_products.reshape(
+            n_components, n_embeddings - i - 1, n_components
+        ).transpose(1, 0, 2)
+        stabilities.append(np.linalg.svd(cross_products, compute_uv=False).sum(axis=1))
+
+    # index order of np.triu_indices matches the order of itertools.combinations
+    i1, i2 = np.triu_indices(n_embeddings, k=1)
+    # rounding can push s marginally above 1 for identical replicates
+    stabilities = np.minimum(np.concatenate(stabilities), 1.0)
+
+    return pd.Series(stabilities, index=list(zip(i1.tolist(), i2.tolist())))
+
+
+def _summed_differences_for_identical_samples(
+    embeddings: List[Embedding],
+) -> npt.NDArray[float]:
+    """Computes the sum of the per-sample distances of all ordered pairs of embeddings after Procrustes matching.
+
+    Requires all embeddings to contain the same samples (see ``_have_identical_samples``). Instead of one Procrustes
+    Analysis per pair, all embeddings are matched to each reference at once using ``match_and_transform_batch``.
+    """
+    summed_differences = np.zeros(embeddings[0].embedding_matrix.shape[0])
+    for i, reference in enumerate(embeddings):
+        comparables = embeddings[:i] + embeddings[i + 1 :]
+        standardized_reference, transformed_comparables, _ = match_and_transform_batch(
+            comparables, reference
+        )
+        diff = transformed_comparables - standardized_reference
+        summed_differences += np.sqrt(np.einsum("knd,knd->kn", diff, diff)).sum(axis=0)
+    return summed_differences
+
+
+# Embeddings (and sample IDs) shared with the worker processes of a BatchEmbeddingComparison. They are transferred
+# once per worker on pool startup, so the individual tasks only need to contain the indices of the embeddings to
+# compare instead of pickling both embeddings for every single pair.
+_worker_embeddings: List[Embedding] = []
+_worker_sample_ids: Optional[pd.Series] = None
+
+
+def _init_worker(
+    embeddings: List[Embedding], sample_ids: Optional[pd.Series] = None
+) -> None:
+    global _worker_embeddings, _worker_sample_ids
+    _limit_worker_threads()
+    _worker_embeddings = embeddings
+    _worker_sample_ids = sample_ids
+
+
+def _worker_pool(
+    embeddings: List[Embedding],
+    threads: Optional[int] = None,
+    sample_ids: Optional[pd.Series] = None,
+) -> concurrent.futures.ProcessPoolExecutor:
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=threads,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(embeddings, sample_ids),
+    )
+
+
+def _blas_threads(threads: Optional[int] = None) -> threadpool_limits:
+    # the batched computations for identical samples run in the calling process instead of the worker pool, which is
+    # usually limited to a single BLAS thread while comparing replicates, so we use multithreaded BLAS instead
+    threads = threads if threads is not None else os.cpu_count() or 1
+    return threadpool_limits(limits=threads)
+
+
+def _get_chunksize(n_tasks: int, threads: Optional[int] = None) -> int:
+    # submit the tasks in a few chunks per worker to reduce the IPC overhead while still balancing the load
+    threads = threads if threads is not None else os.cpu_count() or 1
+    return max(1, n_tasks // (4 * threads))
+
+
 def _cluster_stability_for_pair(args):
-    i1, embedding1, i2, embedding2, kmeans_k = args
-    comparison = EmbeddingComparison(embedding1, embedding2)
+    i1, i2, kmeans_k = args
+    comparison = EmbeddingComparison(_worker_embeddings[i1], _worker_embeddings[i2])
     return pd.Series([comparison.compare_clustering(kmeans_k)], index=[(i1, i2)])
 
 
 def _stability_for_pair(args):
-    (i1, embedding1), (i2, embedding2) = args
-    comparison = EmbeddingComparison(embedding1, embedding2)
+    i1, i2 = args
+    comparison = EmbeddingComparison(_worker_embeddings[i1], _worker_embeddings[i2])
     return pd.Series([comparison.compare()], index=[(i1, i2)])
 
 
 def _difference_for_pair(args):
-    embedding1, embedding2, sample_ids = args
-    comp = EmbeddingComparison(embedding1, embedding2)
-    embedding1 = _pad_missing_samples(sample_ids, comp.comparable)
-    embedding2 = _pad_missing_samples(sample_ids, comp.reference)
+    i1, i2 = args
+    comp = EmbeddingComparison(_worker_embeddings[i1], _worker_embeddings[i2])
+    embedding1 = _pad_missing_samples(_worker_sample_ids, comp.comparable)
+    embedding2 = _pad_missing_samples(_worker_sample_ids, comp.reference)
 
     assert (embedding1.sample_ids == embedding2.sample_ids).all()
-    return np.linalg.norm(
-        embedding1.embedding_matrix - embedding2.embedding_matrix, axis=1
-    )
+    # row-wise euclidean distances of the paired samples, without the abs/power temporaries of np.linalg.norm
+    diff = embedding1.embedding_matrix - embedding2.embedding_matrix
+    return np.sqrt(np.einsum("ij,ij->i", diff, diff))
 
 
-def _get_embedding_norm(args):
-    embedding, sample_ids = args
-    embedding = _pad_missing_samples(sample_ids, embedding).embedding_matrix
-    normalized = normalize(embedding)
-    return np.linalg.norm(normalized, axis=1)
+def _get_embedding_norm(
+    sample_ids: pd.Series, embedding: Embedding
+) -> npt.NDArray[float]:
+    """Norms of the row-normalized embedding vectors of ``embedding`` zero-padded to all ``sample_ids``.
+
+    After normalization, every non-zero embedding vector has norm 1 and every zero vector (including the padded
+    missing samples) has norm 0, so the norms follow directly from the non-zero rows of the embedding matrix without
+    padding and normalizing it.
+    """
+    is_nonzero = np.any(embedding.embedding_matrix != 0, axis=1)
+    norms = pd.Series(is_nonzero, index=embedding.sample_ids.values)
+    return norms.reindex(sample_ids.values, fill_value=False).to_numpy(dtype=float)
 
 
 class EmbeddingComparison:
@@ -276,10 +438,8 @@ class EmbeddingComparison:
         comp_kmeans = self.comparable.cluster(kmeans_k=kmeans_k)
         ref_kmeans = self.reference.cluster(kmeans_k=kmeans_k)
 
-        comp_cluster_labels = comp_kmeans.predict(self.comparable.embedding_matrix)
-        ref_cluster_labels = ref_kmeans.predict(self.reference.embedding_matrix)
-
-        return fowlkes_mallows_score(ref_cluster_labels, comp_cluster_labels)
+        # both KMeans objects are fitted on the respective embedding matrix, so their labels_ are the predicted clusters
+        return fowlkes_mallows_score(ref_kmeans.labels_, comp_kmeans.labels_)
 
 
 class BatchEmbeddingComparison:
@@ -338,12 +498,21 @@ class BatchEmbeddingComparison:
 
             Each value is between 0 and 1 with higher values indicating a higher stability.
         """
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=threads, mp_context=multiprocessing.get_context("spawn")
-        ) as pool:
+        if _have_identical_samples(self.embeddings):
+            # no sample clipping required, so we can compute all pairwise stabilities at once
+            with _blas_threads(threads):
+                pairwise_stabilities = _pairwise_stabilities_for_identical_samples(
+                    self.embeddings
+                )
+            pairwise_stabilities.name = "pandora_stability"
+            return pairwise_stabilities
+
+        args = list(itertools.combinations(range(len(self.embeddings)), r=2))
+        with _worker_pool(self.embeddings, threads) as pool:
             pairwise_stabilities = pool.map(
                 _stability_for_pair,
-                itertools.combinations(enumerate(self.embeddings), r=2),
+                args,
+                chunksize=_get_chunksize(len(args), threads),
             )
 
         pairwise_stabilities = pd.concat(pairwise_stabilities)
@@ -396,15 +565,15 @@ class BatchEmbeddingComparison:
             Each value is between 0 and 1 with higher values indicating a higher stability.
         """
         args = [
-            (i1, embedding1, i2, embedding2, kmeans_k)
-            for (i1, embedding1), (i2, embedding2) in itertools.combinations(
-                enumerate(self.embeddings), r=2
-            )
+            (i1, i2, kmeans_k)
+            for i1, i2 in itertools.combinations(range(len(self.embeddings)), r=2)
         ]
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=threads, mp_context=multiprocessing.get_context("spawn")
-        ) as pool:
-            pairwise_cluster_stabilities = pool.map(_cluster_stability_for_pair, args)
+        with _worker_pool(self.embeddings, threads) as pool:
+            pairwise_cluster_stabilities = pool.map(
+                _cluster_stability_for_pair,
+                args,
+                chunksize=_get_chunksize(len(args), threads),
+            )
 
         pairwise_cluster_stabilities = pd.concat(pairwise_cluster_stabilities)
         pairwise_cluster_stabilities.name = "pandora_cluster_stability"
@@ -431,19 +600,6 @@ class BatchEmbeddingComparison:
         """
         return self.get_pairwise_cluster_stabilities(kmeans_k, threads).mean()
 
-    def _get_pairwise_difference(
-        self, sample_ids: pd.Series, threads: Optional[int] = None
-    ):
-        args = [
-            (embedding1, embedding2, sample_ids)
-            for embedding1, embedding2 in itertools.permutations(self.embeddings, r=2)
-        ]
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=threads, mp_context=multiprocessing.get_context("spawn")
-        ) as pool:
-            diffs = pool.map(_difference_for_pair, args)
-        return list(diffs)
-
     def get_sample_support_values(self, threads: Optional[int] = None) -> pd.Series:
         """Computes the sample support value for each sample respective all ``self.embeddings``.
 
@@ -463,28 +619,36 @@ class BatchEmbeddingComparison:
             Each row corresponds to a sample, with the sample IDs as indices and the PSV as value. The name of the series
             is set to ``"PSV"``.
         """
-        sample_ids_superset = set(
-            [sid for embedding in self.embeddings for sid in embedding.sample_ids]
+        sample_ids_superset = frozenset().union(
+            *(embedding.sample_id_set for embedding in self.embeddings)
         )
         sample_ids_superset = pd.Series(list(sample_ids_superset)).sort_values()
 
-        numerator = np.sum(
-            self._get_pairwise_difference(sample_ids_superset, threads), axis=0
+        if _have_identical_samples(self.embeddings):
+            # no sample clipping or padding required, so we can match all embeddings in batches
+            with _blas_threads(threads):
+                numerator = _summed_differences_for_identical_samples(self.embeddings)
+        else:
+            args = list(itertools.permutations(range(len(self.embeddings)), r=2))
+            with _worker_pool(self.embeddings, threads, sample_ids_superset) as pool:
+                diffs = pool.map(
+                    _difference_for_pair,
+                    args,
+                    chunksize=_get_chunksize(len(args), threads),
+                )
+                numerator = np.sum(list(diffs), axis=0)
+
+        embedding_norms = np.sum(
+            [_get_embedding_norm(sample_ids_superset, e) for e in self.embeddings],
+            axis=0,
         )
+        denominator = 2 * len(self.embeddings) * embedding_norms + 1e-6
+        gini_coefficients = numerator / denominator
 
-        args = [(embedding, sample_ids_superset) for embedding in self.embeddings]
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=threads, mp_context=multiprocessing.get_context("spawn")
-        ) as pool:
-            embedding_norms = pool.map(_get_embedding_norm, args)
-
-        denominator = (
-            2 * len(self.embeddings) * np.sum(list(embedding_norms), axis=0) + 1e-6
+        # sample_ids_superset is sorted, so the support values are sorted by sample ID
+        return pd.Series(
+            1 - gini_coefficients, index=sample_ids_superset.values, name="PSV"
         )
-        gini_coefficients = pd.Series(
-            numerator / denominator, index=sample_ids_superset.values, name="PSV"
-        ).sort_index()
-        return 1 - gini_coefficients
 
 
 def _numpy_to_dataframe(
@@ -514,26 +678,28 @@ def _numpy_to_dataframe(
             f"Numpy embedding matrix must be two dimensional. Passed data has {embedding_matrix.ndim} dimensions."
         )
 
-    embedding_data = pd.DataFrame(
-        embedding_matrix, columns=[f"D{i}" for i in range(embedding_matrix.shape[1])]
-    )
+    n_samples, n_components = embedding_matrix.shape
 
-    if sample_ids.shape[0] != embedding_data.shape[0]:
+    if sample_ids.shape[0] != n_samples:
         raise PandoraException(
             f"One sample ID required for each sample. Got {len(sample_ids)} IDs, "
-            f"but embedding_data has {embedding_data.shape[0]} sample_ids."
+            f"but embedding_data has {n_samples} sample_ids."
         )
 
-    embedding_data["sample_id"] = sample_ids.values
-
-    if populations.shape[0] != embedding_data.shape[0]:
+    if populations.shape[0] != n_samples:
         raise PandoraException(
             f"One population required for each sample. Got {len(populations)} populations, "
-            f"but embedding_data has {embedding_data.shape[0]} sample_ids."
+            f"but embedding_data has {n_samples} sample_ids."
         )
 
+    # construct the dataframe at once instead of adding the sample_id and population columns one by one
+    embedding_data = {
+        column: embedding_matrix[:, i]
+        for i, column in enumerate(_embedding_columns(n_components))
+    }
+    embedding_data["sample_id"] = sample_ids.values
     embedding_data["population"] = populations.values
-    return embedding_data
+    return pd.DataFrame(embedding_data, copy=False)
 
 
 def match_and_transform(
@@ -568,7 +734,7 @@ def match_and_transform(
     """
     comparable, reference = _clip_missing_samples_for_comparison(comparable, reference)
 
-    if not all(comparable.sample_ids == reference.sample_ids):
+    if not np.array_equal(comparable.sample_ids.values, reference.sample_ids.values):
         raise PandoraException(
             "Sample IDS between reference and comparable don't match but is required for comparing PCA results. "
         )
@@ -588,41 +754,96 @@ def match_and_transform(
             "Make sure all sample IDs are correctly annotated"
         )
 
-    standardized_reference, transformed_comparable, disparity = procrustes(
-        ref_data, comp_data
-    )
-
-    # normalize the data prior to comparison
-    standardized_reference = normalize(standardized_reference)
-    transformed_comparable = normalize(transformed_comparable)
-
-    standardized_reference = _numpy_to_dataframe(
-        standardized_reference,
-        reference.sample_ids,
-        reference.populations,
-    )
+    if comparable is reference:
+        # the optimal transformation of an Embedding towards itself is the identity, no need for Procrustes Analysis
+        standardized_reference = Embedding.from_ndarray(
+            embedding_matrix=normalize(reference._centered_normalized),
+            sample_ids=reference.sample_ids,
+            populations=reference.populations,
+            explained_variances=reference.explained_variances,
+        )
+        return standardized_reference, standardized_reference, 0.0
 
-    transformed_comparable = _numpy_to_dataframe(
-        transformed_comparable,
-        comparable.sample_ids,
-        comparable.populations,
+    standardized_reference, transformed_comparable, disparity = _procrustes(
+        reference, comparable
     )
 
-    standardized_reference = Embedding(
-        embedding=standardized_reference,
-        n_components=reference.n_components,
+    # normalize the data prior to comparison
+    standardized_reference = Embedding.from_ndarray(
+        embedding_matrix=normalize(standardized_reference),
+        sample_ids=reference.sample_ids,
+        populations=reference.populations,
         explained_variances=reference.explained_variances,
     )
 
-    transformed_comparable = Embedding(
-        embedding=transformed_comparable,
-        n_components=comparable.n_components,
+    transformed_comparable = Embedding.from_ndarray(
+        embedding_matrix=normalize(transformed_comparable),
+        sample_ids=comparable.sample_ids,
+        populations=comparable.populations,
         explained_variances=comparable.explained_variances,
     )
 
-    if not all(standardized_reference.sample_ids == transformed_comparable.sample_ids):
+    return standardized_reference, transformed_comparable, disparity
+
+
+def match_and_transform_batch(
+    comparables: List[Embedding], reference: Embedding
+) -> Tuple[npt.NDArray[float], npt.NDArray[float], npt.NDArray[float]]:
+    """Batched version of ``match_and_transform`` that matches multiple Embeddings to the same ``reference`` at once.
+
+    All Procrustes Analyses are solved using a single batched SVD of the stacked cross-products of the standardized
+    embedding matrices. In contrast to ``match_and_transform``, all ``comparables`` need to contain exactly the same
+    samples as ``reference``, no samples are clipped.
+
+    Parameters
+    ----------
+    comparables : List[Embedding]
+        The Embeddings that should be transformed.
+    reference : Embedding
+        The Embedding that all comparables should be transformed towards.
+
+    Returns
+    -------
+    standardized_reference : npt.NDArray[float]
+        Standardized embedding matrix of ``reference`` with shape ``(n_samples, n_components)``.
+    transformed_comparables : npt.NDArray[float]
+        Transformed embedding matrices of all ``comparables`` with shape ``(n_comparables, n_samples, n_components)``,
+        created by matching each comparable to ``reference`` as close as possible using Procrustes Analysis.
+    disparities : npt.NDArray[float]
+        The Procrustes disparity of each comparable and ``reference`` (``shape=(n_comparables,)``).
+
+    Raises
+    ------
+    PandoraException
+        If not all ``comparables`` contain the same samples and number of components as ``reference``.
+    """
+    if not _have_identical_samples([reference, *comparables]):
         raise PandoraException(
-            "Sample IDS between reference and comparable don't match but is required for comparing PCA results. "
+            "Batched matching requires all comparables to contain the same samples and number of components as the "
+            "reference. Use match_and_transform instead."
         )
 
-    return standardized_reference, transformed_comparable, disparity
+    standardized_reference = reference._centered_normalized
+    standardized_comparables = np.stack([c._centered_normalized for c in comparables])
+
+    # shape (n_comparables, n_components, n_components)
+    cross_products = np.matmul(standardized_reference.T, standardized_comparables)
+    u, s, vt = np.linalg.svd(cross_products, full_matrices=False)
+    scales = s.sum(axis=1)
+    rotations = np.matmul(u, vt)
+
+    transformed_comparables = np.matmul(
+        standardized_comparables, rotations.transpose(0, 2, 1)
+    )
+    transformed_comparables *= scales[:, np.newaxis, np.newaxis]
+    # rounding can push the scales marginally above 1 for (almost) identical matrices, clamp like in _procrustes
+    disparities = np.maximum(0.0, 1.0 - scales**2)
+
+    # normalize the data prior to comparison, identical to match_and_transform
+    n_components = reference.n_components
+    standardized_reference = normalize(standardized_reference)
+    transformed_comparables = normalize(
+        transformed_comparables.reshape(-1, n_components)
+    ).reshape(transformed_comparables.shape)
+
+    return standardized_reference, transformed_comparables, disparities
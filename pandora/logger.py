@@ -11,7 +11,7 @@ logger = loguru.logger
 
 
 def fmt_message(message):
-    seconds = time.perf_counter() - SCRIPT_CLOCK_START
-    fmt_time = time.strftime("%H:%M:%S", time.gmtime(seconds))
-    time_string = f"[{fmt_time}] "
-    return f"{time_string}{message}"
+    seconds = int(time.perf_counter() - SCRIPT_CLOCK_START)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"[{hours:02d}:{minutes:02d}:{seconds:02d}] {message}"
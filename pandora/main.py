@@ -1,6 +1,5 @@
 import argparse
 import datetime
-import math
 import pathlib
 import sys
 import textwrap
@@ -10,11 +9,6 @@ from pandora import __version__
 from pandora.custom_errors import PandoraConfigException
 from pandora.custom_types import AnalysisMode, FileFormat
 from pandora.logger import SCRIPT_CLOCK_START, START_TIME, fmt_message, logger
-from pandora.pandora import (
-    Pandora,
-    convert_to_eigenstrat_format,
-    pandora_config_from_configfile,
-)
 
 
 def get_header():
@@ -44,10 +38,22 @@ def argument_parser():
 
 @logger.catch
 def main():
-    print(get_header())
-    logger.add(sys.stderr, format="{message}")
-    args = argument_parser()
     """Pandora main program."""
+    # parse the arguments before importing the pandora module (and numpy, scikit-learn, etc. with it)
+    # such that --help and invalid arguments do not have to wait for the imports
+    args = argument_parser()
+    print(get_header())
+    # replace loguru's default sink, otherwise all messages and errors are printed twice
+    # until the configured verbosity is known, only warnings and errors are printed
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING", format="{message}")
+
+    from pandora.pandora import (
+        Pandora,
+        convert_to_eigenstrat_format,
+        pandora_config_from_configfile,
+    )
+
     # =======================================
     # initialize options and directories
     # =======================================
@@ -59,11 +65,13 @@ def main():
 
     # hook up the logfile to the logger to also store the output
     pandora_config.result_dir.mkdir(exist_ok=True, parents=True)
-    pandora_config.pandora_logfile.open(mode="w").write(get_header())
+    pandora_config.pandora_logfile.write_text(get_header())
+    # enqueue the messages so writing to the logfile does not block the computation
     logger.add(
         pandora_config.pandora_logfile,
         level=pandora_config.loglevel,
         format="{message}",
+        enqueue=True,
     )
 
     # log program start and run configuration
@@ -72,11 +80,14 @@ def main():
     logger.info(" ".join(sys.argv))
 
     # log the run configuration
-    _arguments_str = [
-        f"{k}: {v}" for k, v in pandora_config.get_configuration().items()
-    ]
+    # the configuration string is only built if the INFO level is enabled
     logger.info("\n--------- PANDORA CONFIGURATION ---------")
-    logger.info("\n".join(_arguments_str))
+    logger.opt(lazy=True).info(
+        "{}",
+        lambda: "\n".join(
+            f"{k}: {v}" for k, v in pandora_config.get_configuration().items()
+        ),
+    )
 
     # store pandora config in a verbose config file for reproducibility
     pandora_config.save_config()
@@ -88,10 +99,11 @@ def main():
 
     # if necessary, convert the input data to EIGENSTRAT file_format required for bootstrapping/windowing
     if pandora_config.file_format != FileFormat.EIGENSTRAT:
-        logger.info(
-            fmt_message(
+        logger.opt(lazy=True).info(
+            "{}",
+            lambda: fmt_message(
                 f"Converting dataset from {pandora_config.file_format.value} to {FileFormat.EIGENSTRAT.value}"
-            )
+            ),
         )
         # convert the dataset to EIGENSTRAT format and replace the dataset_prefix and file_format in the pandora_config
         convert_prefix = convert_to_eigenstrat_format(
@@ -120,13 +132,13 @@ def main():
         )
 
     logger.info("\n\n========= PANDORA RESULTS =========")
-    logger.info(f"> Input dataset: {pandora_config.dataset_prefix.absolute()}")
+    logger.info(f"> Input dataset: {pandora_config.dataset_prefix}")
 
     pandora_results.log_and_save_replicates_results()
 
     pandora_config.log_results_files()
 
-    total_runtime = math.ceil(time.perf_counter() - SCRIPT_CLOCK_START)
+    total_runtime = int(time.perf_counter() - SCRIPT_CLOCK_START)
     logger.info(
         f"\nTotal runtime: {datetime.timedelta(seconds=total_runtime)} ({total_runtime} seconds)"
     )
@@ -17,8 +17,10 @@ from pydantic import (
     NonNegativeInt,
     PositiveInt,
     ValidationError,
+    field_validator,
 )
 from pydantic.dataclasses import dataclass
+from threadpoolctl import threadpool_limits
 
 from pandora import __version__
 from pandora.bootstrap import bootstrap_and_embed_multiple
@@ -31,6 +33,7 @@ from pandora.custom_types import (
     FileFormat,
 )
 from pandora.dataset import EigenDataset
+from pandora.embedding import Embedding
 from pandora.embedding_comparison import BatchEmbeddingComparison
 from pandora.logger import fmt_message, logger
 from pandora.plotting import (
@@ -41,6 +44,16 @@ from pandora.plotting import (
 )
 from pandora.sliding_window import sliding_window_embedding
 
+# use the libyaml based loader and dumper if PyYAML was built with libyaml support
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# attribute of a dataset that stores the embedding computed by the respective algorithm
+_EMBEDDING_ATTRIBUTES = {
+    EmbeddingAlgorithm.PCA: "pca",
+    EmbeddingAlgorithm.MDS: "mds",
+}
+
 
 @dataclass
 class PandoraConfig(BaseModel):
@@ -51,8 +64,9 @@ class PandoraConfig(BaseModel):
     dataset_prefix : pathlib.Path
         File path prefix pointing to the dataset to use for the Pandora analyses.
         Pandora will look for files called <input>.* so make sure all files have the same prefix.
+        Relative paths are converted to absolute paths.
     result_dir : pathlib.Path
-        Directory where to store all (intermediate) results to.
+        Directory where to store all (intermediate) results to. Relative paths are converted to absolute paths.
     file_format : FileFormat, default=FileFormat.EIGENSTRAT
         Format of the input dataset.
         Can be ANCESTRYMAP, EIGENSTRAT, PED, PACKEDPED, PACKEDANCESTRYMAP. Default is EIGENSTRAT.
@@ -176,6 +190,13 @@ class PandoraConfig(BaseModel):
     def __post_init__(self):
         self.result_dir.mkdir(exist_ok=True, parents=True)
 
+    @field_validator("dataset_prefix", "result_dir")
+    @classmethod
+    def _absolute_path(cls, path: pathlib.Path) -> pathlib.Path:
+        # resolve relative paths once, so logging the paths does not need to call absolute() every time
+        # and the paths stay valid if the working directory changes
+        return path.absolute()
+
     @property
     def pandora_logfile(self) -> pathlib.Path:
         """Returns a path to the Pandora logfile where all results should be logged to.
@@ -317,7 +338,8 @@ class PandoraConfig(BaseModel):
             Dictionary representation of all settings in self. Filepaths are translated to absolute path strings,
             enums are represted by their value.
         """
-        config = dataclasses.asdict(self)
+        # shallow copy of the settings, dataclasses.asdict would needlessly deep-copy all values
+        config = {f.name: getattr(self, f.name) for f in dataclasses.fields(self)}
 
         # pathlib Paths cannot be dumped in yaml directly
         # so we have to manually replace them with their string representation
@@ -339,14 +361,16 @@ class PandoraConfig(BaseModel):
         -------
         None
         """
-        config_yaml = yaml.safe_dump(self.get_configuration())
-        # additionally save the Pandora version
-        self.configfile.open(mode="w").write(f"# PANDORA VERSION {__version__}\n\n")
-        self.configfile.open(mode="a").write(config_yaml)
+        with self.configfile.open(mode="w") as f:
+            # additionally save the Pandora version
+            f.write(f"# PANDORA VERSION {__version__}\n\n")
+            yaml.dump(self.get_configuration(), f, Dumper=_YamlDumper)
 
     def log_results_files(self) -> None:
         """Logs the absolute file paths of all files written during an execution of Pandora.
 
+        All file paths are absolute since ``result_dir`` is converted to an absolute path on initialization.
+
         Returns
         -------
         None
@@ -359,20 +383,16 @@ class PandoraConfig(BaseModel):
                 ------------------"""
             )
         )
-        logger.info(f"> Pandora results: {self.result_file.absolute()}")
-        logger.info(
-            f"> Pairwise stabilities: {self.pairwise_stability_result_file.absolute()}"
-        )
-        logger.info(
-            f"> Sample Support values: {self.sample_support_values_csv.absolute()}"
-        )
+        logger.info(f"> Pandora results: {self.result_file}")
+        logger.info(f"> Pairwise stabilities: {self.pairwise_stability_result_file}")
+        logger.info(f"> Sample Support values: {self.sample_support_values_csv}")
 
         if self.embedding_populations is not None:
             logger.info(
-                f"> Projected Sample Support values: {self.projected_sample_support_values_csv.absolute()}"
+                f"> Projected Sample Support values: {self.projected_sample_support_values_csv}"
             )
         if self.plot_results:
-            logger.info(f"> All plots saved in directory: {self.plot_dir.absolute()}")
+            logger.info(f"> All plots saved in directory: {self.plot_dir}")
 
 
 class Pandora:
@@ -408,9 +428,18 @@ class Pandora:
         Pandas dataframe containing the support values for all samples of ``self.dataset`` for all pairwise
         replicate comparisons.
         This is empty until ``self.bootstrap_embeddings()`` or ``self.sliding_window()`` was called.
+
+    Raises
+    ------
+    PandoraConfigException
+        - If ``pandora_config.embedding_algorithm`` is not a valid ``EmbeddingAlgorithm``.
     """
 
     def __init__(self, pandora_config: PandoraConfig):
+        if pandora_config.embedding_algorithm not in _EMBEDDING_ATTRIBUTES:
+            raise PandoraConfigException(
+                f"Unrecognized embedding algorithm: {pandora_config.embedding_algorithm}."
+            )
         self.pandora_config: PandoraConfig = pandora_config
         self.dataset: EigenDataset = EigenDataset(
             file_prefix=pandora_config.dataset_prefix,
@@ -465,10 +494,9 @@ class Pandora:
 
         # determine the optimal number of clusters if not manually set by user
         if self.pandora_config.kmeans_k is None:
-            if self.pandora_config.embedding_algorithm == EmbeddingAlgorithm.PCA:
-                self.pandora_config.kmeans_k = self.dataset.pca.get_optimal_kmeans_k()
-            else:
-                self.pandora_config.kmeans_k = self.dataset.mds.get_optimal_kmeans_k()
+            self.pandora_config.kmeans_k = self._get_embedding(
+                self.dataset
+            ).get_optimal_kmeans_k(threads=self.pandora_config.threads)
 
         if self.pandora_config.plot_results:
             self.pandora_config.plot_dir.mkdir(exist_ok=True, parents=True)
@@ -477,32 +505,32 @@ class Pandora:
             )
             self._plot_dataset(self.dataset, self.dataset.name)
 
-    def _plot_dataset(self, dataset: EigenDataset, plot_prefix: str) -> None:
-        if self.pandora_config.embedding_algorithm == EmbeddingAlgorithm.PCA:
-            embedding = dataset.pca
-        elif self.pandora_config.embedding_algorithm == EmbeddingAlgorithm.MDS:
-            embedding = dataset.mds
-        else:
+    def _get_embedding(self, dataset: EigenDataset) -> Optional[Embedding]:
+        # returns the embedding of dataset as computed by the configured embedding algorithm
+        try:
+            attribute = _EMBEDDING_ATTRIBUTES[self.pandora_config.embedding_algorithm]
+        except KeyError as e:
             raise PandoraConfigException(
                 f"Unrecognized embedding algorithm: {self.pandora_config.embedding_algorithm}."
-            )
+            ) from e
+        return getattr(dataset, attribute)
+
+    def _plot_dataset(self, dataset: EigenDataset, plot_prefix: str) -> None:
+        embedding = self._get_embedding(dataset)
 
         if embedding is None:
             raise PandoraException(
                 "Embedding not yet run for dataset. Nothing to plot."
             )
 
+        plot_dir = self.pandora_config.plot_dir
         pcx = self.pandora_config.plot_dim_x
         pcy = self.pandora_config.plot_dim_y
 
         # plot with annotated populations
         fig = plot_populations(embedding, pcx, pcy)
-        fig.write_image(
-            self.pandora_config.plot_dir / f"{plot_prefix}_with_populations.pdf"
-        )
-        fig.write_html(
-            self.pandora_config.plot_dir / f"{plot_prefix}_with_populations.html"
-        )
+        fig.write_image(plot_dir / f"{plot_prefix}_with_populations.pdf")
+        fig.write_html(plot_dir / f"{plot_prefix}_with_populations.html")
 
         # plot with annotated clusters
         fig = plot_clusters(
@@ -511,12 +539,8 @@ class Pandora:
             dim_y=pcy,
             kmeans_k=self.pandora_config.kmeans_k,
         )
-        fig.write_image(
-            self.pandora_config.plot_dir / f"{plot_prefix}_with_clusters.pdf"
-        )
-        fig.write_html(
-            self.pandora_config.plot_dir / f"{plot_prefix}_with_clusters.html"
-        )
+        fig.write_image(plot_dir / f"{plot_prefix}_with_clusters.pdf")
+        fig.write_html(plot_dir / f"{plot_prefix}_with_clusters.html")
 
         if len(self.dataset.embedding_populations) > 0:
             fig = plot_projections(
@@ -525,12 +549,8 @@ class Pandora:
                 dim_x=pcx,
                 dim_y=pcy,
             )
-            fig.write_image(
-                self.pandora_config.plot_dir / f"{plot_prefix}_projections.pdf"
-            )
-            fig.write_html(
-                self.pandora_config.plot_dir / f"{plot_prefix}_projections.html"
-            )
+            fig.write_image(plot_dir / f"{plot_prefix}_projections.pdf")
+            fig.write_html(plot_dir / f"{plot_prefix}_projections.html")
 
     def bootstrap_embeddings(self) -> None:
         """Draws bootstrap replicates of ``self.dataset`` and computes and compares the respective embedding for all
@@ -640,7 +660,10 @@ class Pandora:
             else "sliding window"
         )
         logger.info(fmt_message(f"Comparing {analysis_string} embedding results."))
-        self._compare_replicates_similarity()
+        # the replicates are compared in parallel, so we limit the number of OMP/BLAS threads to prevent oversubscription
+        # (comparisons of replicates with identical samples run batched in this process using self.pandora_config.threads)
+        with threadpool_limits(limits=1):
+            self._compare_replicates_similarity()
 
         if self.pandora_config.plot_results:
             self.pandora_config.plot_dir.mkdir(exist_ok=True, parents=True)
@@ -658,14 +681,7 @@ class Pandora:
     def _plot_sample_support_values(
         self, projected_samples_only: bool = False
     ) -> go.Figure:
-        if self.pandora_config.embedding_algorithm == EmbeddingAlgorithm.PCA:
-            embedding = self.dataset.pca
-        elif self.pandora_config.embedding_algorithm == EmbeddingAlgorithm.MDS:
-            embedding = self.dataset.mds
-        else:
-            raise PandoraConfigException(
-                f"Unrecognized embedding algorithm: {self.pandora_config.embedding_algorithm}."
-            )
+        embedding = self._get_embedding(self.dataset)
 
         if embedding is None:
             raise PandoraException(
@@ -701,25 +717,17 @@ class Pandora:
 
     def _compare_replicates_similarity(self) -> None:
         # Compare all replicates pairwise
-        if self.pandora_config.embedding_algorithm == EmbeddingAlgorithm.PCA:
-            embedding = self.dataset.pca
-            batch_comparison = BatchEmbeddingComparison(
-                [b.pca for b in self.replicates]
-            )
-        elif self.pandora_config.embedding_algorithm == EmbeddingAlgorithm.MDS:
-            embedding = self.dataset.mds
-            batch_comparison = BatchEmbeddingComparison(
-                [b.mds for b in self.replicates]
-            )
-        else:
-            raise PandoraConfigException(
-                f"Unrecognized embedding algorithm: {self.pandora_config.embedding_algorithm}."
-            )
+        embedding = self._get_embedding(self.dataset)
+        batch_comparison = BatchEmbeddingComparison(
+            [self._get_embedding(replicate) for replicate in self.replicates]
+        )
 
         if self.pandora_config.kmeans_k is not None:
             kmeans_k = self.pandora_config.kmeans_k
         else:
-            kmeans_k = embedding.get_optimal_kmeans_k()
+            kmeans_k = embedding.get_optimal_kmeans_k(
+                threads=self.pandora_config.threads
+            )
 
         if len(self.replicates) == 0:
             raise PandoraException("No replicates to compare!")
@@ -778,28 +786,25 @@ class Pandora:
             Pandora Cluster Stability: {round(self.pandora_cluster_stability, _rd)}"""
         )
 
-        self.pandora_config.result_file.open(mode="w").write(results_string)
+        self.pandora_config.result_file.write_text(results_string)
         logger.info(results_string)
 
         self._log_and_save_sample_support_values()
 
     def _log_support_values(self, title: str, support_values: pd.Series) -> None:
-        _rd = self.pandora_config.result_decimals
-        _min = round(support_values.min(), _rd)
-        _max = round(support_values.max(), _rd)
-        _mean = round(support_values.mean(), _rd)
-        _median = round(support_values.median(), _rd)
-        _stdev = round(support_values.std(), _rd)
+        stats = support_values.agg(["min", "max", "mean", "median", "std"]).round(
+            self.pandora_config.result_decimals
+        )
 
         support_values_result_string = textwrap.dedent(
             f"""
             ------------------
             {title}: Support values
             ------------------
-            > average ± standard deviation: {_mean} ± {_stdev}
-            > median: {_median}
-            > lowest support value: {_min}
-            > highest support value: {_max}
+            > average ± standard deviation: {stats["mean"]} ± {stats["std"]}
+            > median: {stats["median"]}
+            > lowest support value: {stats["min"]}
+            > highest support value: {stats["max"]}
             """
         )
         logger.info(support_values_result_string)
@@ -815,9 +820,10 @@ class Pandora:
         if self.dataset.projected_samples.empty:
             return
 
-        projected_support_values = self.sample_support_values.loc[
-            lambda x: x.index.isin(self.dataset.projected_samples)
-        ]
+        projected_mask = self.sample_support_values.index.isin(
+            self.dataset.projected_samples
+        )
+        projected_support_values = self.sample_support_values[projected_mask]
 
         projected_support_values.to_csv(
             self.pandora_config.projected_sample_support_values_csv
@@ -848,7 +854,8 @@ def pandora_config_from_configfile(configfile: pathlib.Path) -> PandoraConfig:
         - If the config file does not specify a ``result_dir``.
         - If the ``PandoraConfig`` object could not be initialized. This is most likely due to misspecified config options.
     """
-    config_data = yaml.safe_load(configfile.open())
+    with configfile.open() as f:
+        config_data = yaml.load(f, Loader=_YamlLoader)
 
     dataset_prefix = config_data.get("dataset_prefix")
     if dataset_prefix is None:
@@ -482,37 +482,22 @@ def plot_support_values(
     ]
 
     if projected_samples is not None:
-        marker_colors = []
-        marker_text = []
-
-        for idx, row in embedding.iterrows():
-            if row.sample_id in projected_samples.values:
-                # check if the sample is projected, if so the marker color should be according to it's support
-                support = sample_support_values.loc[
-                    lambda x: x.index == row.sample_id
-                ].item()
-                marker_colors.append(support)
-                if support < support_value_rogue_cutoff:
-                    # if the support is worse than the threshold, annotate the projected sample
-                    marker_text.append(f"{round(support, 2)}<br>({row.sample_id})")
-                else:
-                    # do not annotate
-                    marker_text.append("")
-            else:
-                # otherwise print an unlabeled, gray marker
-                marker_colors.append("lightgray")
-                marker_text.append("")
-
+        # only projected samples are color-coded according to their support, all others are shown as gray markers
+        is_color_coded = embedding.sample_id.isin(projected_samples)
+        marker_colors = embedding.support.where(is_color_coded, "lightgray").tolist()
     else:
-        marker_colors = list(sample_support_values.values)
-
-        # annotate only samples with support below support_value_rogue_cutoff
-        marker_text = [
-            f"{round(support, 2)}<br>({sample})"
-            if support < support_value_rogue_cutoff
-            else ""
-            for (sample, support) in sorted(sample_support_values.items())
-        ]
+        is_color_coded = pd.Series(True, index=embedding.index)
+        marker_colors = embedding.support.tolist()
+
+    # annotate only color-coded samples with support below support_value_rogue_cutoff
+    is_annotated = is_color_coded & (embedding.support < support_value_rogue_cutoff)
+    annotations = (
+        embedding.support.round(2).astype(str)
+        + "<br>("
+        + embedding.sample_id.astype(str)
+        + ")"
+    )
+    marker_text = annotations.where(is_annotated, "").tolist()
 
     fig = go.Figure(
         go.Scatter(
@@ -656,11 +641,16 @@ def plot_embedding_comparison_rogue_samples(
 
     rogue_samples = support_values.loc[lambda x: x < support_value_rogue_cutoff]
 
-    rogue_colors = get_distinct_colors(rogue_samples.shape[0])
-    rogue_text = [
-        f"{sample_id}<br>({round(support, 2)})"
-        for sample_id, support in rogue_samples.items()
-    ]
+    # color and text lookups are indexed by sample ID and mapped onto the embeddings to keep them aligned
+    rogue_colors = pd.Series(
+        get_distinct_colors(rogue_samples.shape[0]), index=rogue_samples.index
+    )
+    rogue_text = (
+        rogue_samples.index.astype(str)
+        + "<br>("
+        + rogue_samples.round(2).astype(str)
+        + ")"
+    )
 
     rogue_reference = embedding_comparison.reference.embedding.loc[
         lambda x: x.sample_id.isin(rogue_samples.index)
@@ -697,8 +687,8 @@ def plot_embedding_comparison_rogue_samples(
             go.Scatter(
                 x=rogue_reference[xcol],
                 y=rogue_reference[ycol],
-                marker_color=rogue_colors,
-                text=rogue_text,
+                marker_color=rogue_reference.sample_id.map(rogue_colors).tolist(),
+                text=rogue_reference.sample_id.map(rogue_text).tolist(),
                 textposition="bottom center",
                 mode="markers+text",
                 showlegend=False,
@@ -708,9 +698,9 @@ def plot_embedding_comparison_rogue_samples(
             go.Scatter(
                 x=rogue_comparable[xcol],
                 y=rogue_comparable[ycol],
-                marker_color=rogue_colors,
+                marker_color=rogue_comparable.sample_id.map(rogue_colors).tolist(),
                 marker_symbol="star",
-                text=rogue_text,
+                text=rogue_comparable.sample_id.map(rogue_text).tolist(),
                 textposition="bottom center",
                 mode="markers+text",
                 showlegend=False,
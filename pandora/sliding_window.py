@@ -7,6 +7,7 @@ from typing import Callable, Dict, List, Optional, Tuple
 import pandas as pd
 from numpy import typing as npt
 
+from pandora import _limit_worker_threads
 from pandora.custom_errors import PandoraException
 from pandora.custom_types import EmbeddingAlgorithm, Executable
 from pandora.dataset import EigenDataset, NumpyDataset
@@ -121,7 +122,7 @@ def sliding_window_embedding(
         for i, window in enumerate(sliding_windows)
     ]
 
-    with Pool(threads) as p:
+    with Pool(threads, initializer=_limit_worker_threads) as p:
         sliding_windows = list(p.map(_embed_window, args))
 
     return sliding_windows
@@ -214,7 +215,7 @@ def sliding_window_embedding_numpy(
         for window in dataset.get_windows(n_windows)
     ]
 
-    with Pool(threads) as p:
+    with Pool(threads, initializer=_limit_worker_threads) as p:
         sliding_windows = list(p.map(_embed_window_numpy, args))
 
     return sliding_windows
@@ -1,5 +1,6 @@
 import pathlib
 import shutil
+from typing import List
 
 import numpy as np
 import pandas as pd
@@ -53,6 +54,34 @@ def pca_example(correct_smartpca_result_prefix) -> Embedding:
     )
 
 
+@pytest.fixture(params=[0, 42], ids=lambda seed: f"seed{seed}")
+def random_embeddings(request) -> List[Embedding]:
+    # four different random embeddings with three components that all contain the same 20 samples
+    rng = np.random.default_rng(request.param)
+    sample_ids = pd.Series([f"sample{i:02d}" for i in range(20)])
+    populations = pd.Series(["pop"] * 20)
+    return [
+        Embedding.from_ndarray(
+            rng.random((20, 3)), sample_ids, populations, np.asarray([0.5, 0.3, 0.2])
+        )
+        for _ in range(4)
+    ]
+
+
+@pytest.fixture(params=range(20), ids=lambda seed: f"seed{seed}")
+def equal_embeddings(request) -> List[Embedding]:
+    # three equal, but distinct Embedding objects, used to check for rounding issues with identical data
+    data = np.random.default_rng(request.param).normal(size=(10, 2))
+    sample_ids = pd.Series([f"sample{i}" for i in range(10)])
+    populations = pd.Series(["pop"] * 10)
+    return [
+        Embedding.from_ndarray(
+            data.copy(), sample_ids, populations, np.asarray([0.5, 0.5])
+        )
+        for _ in range(3)
+    ]
+
+
 @pytest.fixture
 def test_numpy_dataset():
     test_data = np.asarray(
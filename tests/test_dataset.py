@@ -500,6 +500,12 @@ class TestNumpyDataset:
             bootstrap.populations, test_numpy_dataset.populations
         )
 
+    def test_bootstrap_is_reproducible_with_seed(self, test_numpy_dataset):
+        bootstrap1 = test_numpy_dataset.bootstrap(42)
+        bootstrap2 = test_numpy_dataset.bootstrap(42)
+
+        np.testing.assert_equal(bootstrap1.input_data, bootstrap2.input_data)
+
     def test_get_windows(self, test_numpy_dataset):
         n_snps = test_numpy_dataset.input_data.shape[1]
         n_windows = 3
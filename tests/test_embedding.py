@@ -5,7 +5,7 @@ import pandas as pd
 import pytest
 
 from pandora.custom_errors import PandoraException
-from pandora.embedding import Embedding, check_smartpca_results
+from pandora.embedding import Embedding, check_smartpca_results, from_smartpca
 
 
 class TestPCA:
@@ -90,6 +90,104 @@ class TestPCA:
             # column PC1 incorrectly named
             Embedding(data, n_components, explained_variances)
 
+    def test_init_sorts_by_sample_id(self):
+        data = pd.DataFrame(
+            {
+                "D0": [0.1, 0.2, 0.3],
+                "sample_id": ["sample2", "sample3", "sample1"],
+                "population": ["pop2", "pop3", "pop1"],
+            }
+        )
+
+        pca = Embedding(data, 1, np.asarray([0.0]))
+        assert pca.sample_ids.tolist() == ["sample1", "sample2", "sample3"]
+        np.testing.assert_equal(pca.embedding_matrix, [[0.3], [0.1], [0.2]])
+
+    def test_from_ndarray(self):
+        embedding_matrix = np.asarray([[0.1, 0.4], [0.2, 0.5], [0.3, 0.6]])
+        sample_ids = pd.Series(["sample2", "sample3", "sample1"])
+        populations = pd.Series(["pop2", "pop3", "pop1"])
+        explained_variances = np.asarray([0.0, 0.0])
+
+        pca = Embedding.from_ndarray(
+            embedding_matrix, sample_ids, populations, explained_variances
+        )
+
+        # data should be sorted by sample ID, identical to initializing with a dataframe
+        expected = Embedding(
+            pd.DataFrame(
+                {
+                    "D0": embedding_matrix[:, 0],
+                    "D1": embedding_matrix[:, 1],
+                    "sample_id": sample_ids,
+                    "population": populations,
+                }
+            ),
+            2,
+            explained_variances,
+        )
+        np.testing.assert_equal(pca.embedding_matrix, expected.embedding_matrix)
+        pd.testing.assert_series_equal(pca.sample_ids, expected.sample_ids)
+        pd.testing.assert_series_equal(pca.populations, expected.populations)
+        pd.testing.assert_frame_equal(pca.embedding, expected.embedding)
+
+        with pytest.raises(PandoraException, match="two dimensional"):
+            Embedding.from_ndarray(
+                embedding_matrix[:, 0], sample_ids, populations, explained_variances
+            )
+
+        with pytest.raises(PandoraException, match="One sample ID required"):
+            Embedding.from_ndarray(
+                embedding_matrix, sample_ids[:2], populations, explained_variances
+            )
+
+        with pytest.raises(PandoraException, match="One population required"):
+            Embedding.from_ndarray(
+                embedding_matrix, sample_ids, populations[:2], explained_variances
+            )
+
+        with pytest.raises(
+            PandoraException, match="Explained variance required for each PC"
+        ):
+            Embedding.from_ndarray(
+                embedding_matrix, sample_ids, populations, np.asarray([0.0])
+            )
+
+    def test_get_optimal_kmeans_k(self):
+        # four well separated clusters of 25 samples each
+        rng = np.random.default_rng(42)
+        centers = np.asarray([[0, 0], [10, 0], [0, 10], [10, 10]])
+        embedding_matrix = np.concatenate(
+            [center + rng.normal(scale=0.1, size=(25, 2)) for center in centers]
+        )
+        data = pd.DataFrame(
+            {
+                "D0": embedding_matrix[:, 0],
+                "D1": embedding_matrix[:, 1],
+                "sample_id": [f"sample{i}" for i in range(100)],
+                "population": ["pop1"] * 100,
+            }
+        )
+        pca = Embedding(data, 2, np.asarray([0.5, 0.5]))
+
+        assert pca.get_optimal_kmeans_k(k_boundaries=(2, 8)) == 4
+
+    @pytest.mark.parametrize("k_boundaries", [None, (5, 5), (6, 2)])
+    def test_get_optimal_kmeans_k_fails_for_empty_k_range(self, k_boundaries):
+        # three populations -> the automatically determined range of k is [3, 3)
+        data = pd.DataFrame(
+            {
+                "D0": np.arange(9, dtype=float),
+                "D1": np.arange(9, dtype=float) ** 2,
+                "sample_id": [f"sample{i}" for i in range(9)],
+                "population": ["pop1", "pop2", "pop3"] * 3,
+            }
+        )
+        pca = Embedding(data, 2, np.asarray([0.5, 0.5]))
+
+        with pytest.raises(PandoraException, match="range of k .* is empty"):
+            pca.get_optimal_kmeans_k(k_boundaries=k_boundaries)
+
 
 def test_check_smartpca_results_passes_for_correct_results(
     correct_smartpca_result_prefix,
@@ -99,3 +197,103 @@ def test_check_smartpca_results_passes_for_correct_results(
 
     # should run without any issues
     check_smartpca_results(evec, eval)
+
+
+@pytest.mark.parametrize(
+    "evec_content",
+    [
+        # missing #eigvals header
+        "S0 -0.6 -0.09 Case\n",
+        # non-float PC value
+        "#eigvals: 3.1 0.4\nS0 -0.6 abc Case\nS1 -0.3 -0.07 Case\n",
+        # non-numeric PC column
+        "#eigvals: 3.1 0.4\nS0 -0.6 True Case\nS1 -0.3 False Case\n",
+        # missing PC value
+        "#eigvals: 3.1 0.4\nS0 -0.6 -0.09 Case\nS1 -0.3 Case\n",
+        # too many PC values
+        "#eigvals: 3.1 0.4\nS0 -0.6 -0.09 Case\nS1 -0.3 -0.07 0.1 Case\n",
+        # blank line
+        "#eigvals: 3.1 0.4\nS0 -0.6 -0.09 Case\n\nS1 -0.3 -0.07 Case\n",
+        # whitespace-only line
+        "#eigvals: 3.1 0.4\nS0 -0.6 -0.09 Case\n  \t \nS1 -0.3 -0.07 Case\n",
+    ],
+)
+def test_check_smartpca_results_fails_for_incorrect_evec(
+    correct_smartpca_result_prefix, tmp_path, evec_content
+):
+    evec = tmp_path / "incorrect.evec"
+    evec.write_text(evec_content)
+    eval = pathlib.Path(f"{correct_smartpca_result_prefix}.eval")
+
+    with pytest.raises(PandoraException, match="evec result file appears"):
+        check_smartpca_results(evec, eval)
+
+
+@pytest.mark.parametrize(
+    "eval_content",
+    [
+        # non-float eigenvalue
+        "3.1\nabc\n",
+        # more than one value per line
+        "3.1 0.4\n",
+        # blank line
+        "3.1\n\n0.4\n",
+        # comment line
+        "3.1\n# 0.4\n",
+    ],
+)
+def test_check_smartpca_results_fails_for_incorrect_eval(
+    correct_smartpca_result_prefix, tmp_path, eval_content
+):
+    evec = pathlib.Path(f"{correct_smartpca_result_prefix}.evec")
+    eval = tmp_path / "incorrect.eval"
+    eval.write_text(eval_content)
+
+    with pytest.raises(PandoraException, match="eval result file appears"):
+        check_smartpca_results(evec, eval)
+
+
+@pytest.mark.parametrize(
+    "evec_content, expected_embedding",
+    [
+        # NaN and infinite PC values are floats
+        (
+            "#eigvals: 3.1 0.4\nS0 -0.6 nan Case\nS1 -0.3 inf Case\n",
+            [[-0.6, np.nan], [-0.3, np.inf]],
+        ),
+        # any whitespace separates the values, as in smartpca's padded output
+        (
+            "#eigvals: 3.1 0.4\nS0\t-0.6\t-0.09\tCase\n   S1   -0.3  -0.07  Case  \n",
+            [[-0.6, -0.09], [-0.3, -0.07]],
+        ),
+    ],
+)
+def test_from_smartpca_for_unusual_but_correct_evec(
+    tmp_path, evec_content, expected_embedding
+):
+    evec = tmp_path / "correct.evec"
+    evec.write_text(evec_content)
+    eval = tmp_path / "correct.eval"
+    eval.write_text("3.1\n0.4\n")
+
+    check_smartpca_results(evec, eval)
+    pca = from_smartpca(evec, eval)
+
+    assert pca.sample_ids.tolist() == ["S0", "S1"]
+    assert pca.populations.tolist() == ["Case", "Case"]
+    np.testing.assert_array_equal(pca.embedding_matrix, expected_embedding)
+
+
+def test_from_smartpca_keeps_na_like_labels(tmp_path):
+    evec = tmp_path / "na_labels.evec"
+    evec.write_text(
+        "#eigvals: 3.1 0.4\nNA -0.6 -0.09 None\nS1 -0.3 -0.07 NA\nnull 0.2 0.1 nan\n"
+    )
+    eval = tmp_path / "na_labels.eval"
+    eval.write_text("3.1\n0.4\n")
+
+    check_smartpca_results(evec, eval)
+    pca = from_smartpca(evec, eval)
+
+    assert pca.sample_ids.tolist() == ["NA", "S1", "null"]
+    assert pca.populations.tolist() == ["None", "NA", "nan"]
@@ -1,7 +1,10 @@
 import numpy as np
 import pandas as pd
 import pytest
+from scipy.spatial import procrustes
+from threadpoolctl import threadpool_limits
 
+from pandora import embedding_comparison
 from pandora.custom_errors import PandoraException
 from pandora.custom_types import EmbeddingAlgorithm
 from pandora.embedding import Embedding
@@ -11,7 +14,9 @@ from pandora.embedding_comparison import (
     _clip_missing_samples_for_comparison,
     _numpy_to_dataframe,
     _pad_missing_samples,
+    _procrustes,
     match_and_transform,
+    match_and_transform_batch,
 )
 
 
@@ -27,6 +32,90 @@ def test_match_and_transform_identical_pcas(pca_example):
     # pca1 and pca2 should have identical sample IDs
     pd.testing.assert_series_equal(pca1.sample_ids, pca2.sample_ids)
 
+    # comparing an Embedding to a copy of itself should give the same results
+    pca_copy = Embedding(
+        pca_example.embedding.copy(),
+        pca_example.n_components,
+        pca_example.explained_variances,
+    )
+    pca1_copy, pca2_copy, disparity_copy = match_and_transform(pca_copy, pca_example)
+    assert disparity_copy == pytest.approx(disparity, abs=1e-6)
+    np.testing.assert_allclose(pca1_copy.embedding_matrix, pca1.embedding_matrix)
+    np.testing.assert_allclose(pca2_copy.embedding_matrix, pca2.embedding_matrix)
+
+
+def test_procrustes_matches_scipy_procrustes(random_embeddings):
+    reference, comparable, *_ = random_embeddings
+
+    expected = procrustes(reference.embedding_matrix, comparable.embedding_matrix)
+    actual = _procrustes(reference, comparable)
+
+    np.testing.assert_allclose(actual[0], expected[0])
+    np.testing.assert_allclose(actual[1], expected[1])
+    assert actual[2] == pytest.approx(expected[2])
+
+
+def test_procrustes_disparity_is_non_negative_for_equal_embeddings(equal_embeddings):
+    reference, comparable, _ = equal_embeddings
+
+    _, _, disparity = _procrustes(reference, comparable)
+    assert disparity >= 0
+
+    assert 0 <= EmbeddingComparison(comparable, reference).compare() <= 1
+
+
+def test_match_and_transform_batch(random_embeddings):
+    reference, *comparables = random_embeddings
+
+    (
+        standardized_reference,
+        transformed_comparables,
+        disparities,
+    ) = match_and_transform_batch(comparables, reference)
+    assert transformed_comparables.shape == (3, 20, 3)
+    assert disparities.shape == (3,)
+
+    # the batched results should be identical to matching each comparable individually
+    for i, comparable in enumerate(comparables):
+        (
+            expected_reference,
+            expected_comparable,
+            expected_disparity,
+        ) = match_and_transform(comparable, reference)
+        np.testing.assert_allclose(
+            standardized_reference, expected_reference.embedding_matrix
+        )
+        np.testing.assert_allclose(
+            transformed_comparables[i], expected_comparable.embedding_matrix
+        )
+        assert disparities[i] == pytest.approx(expected_disparity)
+
+    # all comparables need to contain the same samples as the reference
+    with pytest.raises(PandoraException, match="same samples"):
+        match_and_transform_batch(
+            [
+                Embedding.from_ndarray(
+                    reference.embedding_matrix[:19],
+                    reference.sample_ids[:19],
+                    reference.populations[:19],
+                    reference.explained_variances,
+                )
+            ],
+            reference,
+        )
+
+
+def test_match_and_transform_batch_for_equal_embeddings(equal_embeddings):
+    reference, *comparables = equal_embeddings
+
+    _, _, disparities = match_and_transform_batch(comparables, reference)
+
+    # the batched disparities should be identical to the disparities of matching each comparable individually
+    for comparable, disparity in zip(comparables, disparities):
+        _, _, expected_disparity = match_and_transform(comparable, reference)
+        assert disparity == expected_disparity
+    assert (disparities >= 0).all()
+
 
 def test_clip_missing_samples_for_comparison(pca_example):
     # use only four of the samples from pca_reference
@@ -53,6 +142,52 @@ def test_clip_missing_samples_for_comparison(pca_example):
     assert set(comparable_clipped.sample_ids) == present_in_both
     assert set(reference_clipped.sample_ids) == present_in_both
 
+    # all samples of the comparable are present in the reference, so it should not be modified
+    assert comparable_clipped is pca_comparable_fewer_samples
+
+    # identical samples in both Embeddings -> nothing to clip
+    pca_copy = Embedding(
+        pca_example.embedding.copy(),
+        pca_example.n_components,
+        pca_example.explained_variances,
+    )
+    comparable_clipped, reference_clipped = _clip_missing_samples_for_comparison(
+        pca_copy, pca_example
+    )
+    assert comparable_clipped is pca_copy
+    assert reference_clipped is pca_example
+
+
+def test_clip_missing_samples_for_comparison_with_duplicate_sample_ids():
+    sample_ids = pd.Series(["sample1", "sample2", "sample2", "sample3", "sample4"])
+    populations = pd.Series(["pop"] * 5)
+    data = np.random.default_rng(42).random((5, 2))
+    comparable = Embedding.from_ndarray(
+        data, sample_ids, populations, np.asarray([0.5, 0.5])
+    )
+    # the reference contains the same data plus one additional sample, so the reference is clipped
+    reference = Embedding.from_ndarray(
+        np.concatenate([data, [[10.0, 10.0]]]),
+        pd.concat([sample_ids, pd.Series(["sample5"])], ignore_index=True),
+        pd.Series(["pop"] * 6),
+        np.asarray([0.5, 0.5]),
+    )
+
+    comparable_clipped, reference_clipped = _clip_missing_samples_for_comparison(
+        comparable, reference
+    )
+
+    # both rows of the duplicated sample ID are kept in both Embeddings
+    np.testing.assert_array_equal(comparable_clipped.sample_ids, sample_ids)
+    np.testing.assert_array_equal(reference_clipped.sample_ids, sample_ids)
+
+    # and the rows of both Embeddings still line up: each row holds the data of the same sample in both
+    np.testing.assert_array_equal(comparable_clipped.embedding_matrix, data)
+    np.testing.assert_array_equal(reference_clipped.embedding_matrix, data)
+
+    # so comparing both Embeddings yields a perfect stability
+    assert EmbeddingComparison(comparable, reference).compare() == pytest.approx(1)
+
 
 def test_match_and_transform_fails_for_different_sample_ids(pca_example):
     with pytest.warns(UserWarning, match="More than 20% of samples"), pytest.raises(
@@ -296,3 +431,64 @@ class TestBatchEmbeddingComparison:
         assert support_values.shape == (n_unique_samples,)
         assert (0 <= support_values).all()
         assert (support_values <= 1).all()
+
+
+class TestBatchEmbeddingComparisonForIdenticalSamples:
+    def test_get_pairwise_stabilities(self, random_embeddings):
+        pairwise_stabilities = BatchEmbeddingComparison(
+            random_embeddings
+        ).get_pairwise_stabilities()
+
+        # four embeddings -> six unique pairs
+        assert pairwise_stabilities.shape == (6,)
+        # the stabilities should be identical to the pairwise comparisons
+        for (i1, i2), stability in pairwise_stabilities.items():
+            expected = EmbeddingComparison(
+                random_embeddings[i1], random_embeddings[i2]
+            ).compare()
+            assert stability == pytest.approx(expected)
+
+    def test_get_pairwise_stabilities_for_equal_embeddings(self, equal_embeddings):
+        pairwise_stabilities = BatchEmbeddingComparison(
+            equal_embeddings
+        ).get_pairwise_stabilities()
+
+        # all embeddings are equal copies -> all stabilities are 1, but never larger
+        assert (pairwise_stabilities <= 1).all()
+        assert pairwise_stabilities.values == pytest.approx(1)
+
+    @pytest.mark.parametrize(
+        "method", ["get_pairwise_stabilities", "get_sample_support_values"]
+    )
+    def test_fast_path_matches_general_path(
+        self, random_embeddings, method, monkeypatch
+    ):
+        batch = BatchEmbeddingComparison(random_embeddings)
+        fast_path_result = getattr(batch, method)()
+
+        # force the per-pair computation that supports differing samples
+        monkeypatch.setattr(
+            embedding_comparison, "_have_identical_samples", lambda _: False
+        )
+        general_path_result = getattr(batch, method)()
+
+        pd.testing.assert_series_equal(fast_path_result, general_path_result)
+
+    @pytest.mark.parametrize(
+        "method", ["get_pairwise_stabilities", "get_sample_support_values"]
+    )
+    def test_uses_threads(self, random_embeddings, method, monkeypatch):
+        blas_limits = []
+
+        def _record_blas_limits(limits=None, **kwargs):
+            blas_limits.append(limits)
+            return threadpool_limits(limits=limits, **kwargs)
+
+        monkeypatch.setattr(
+            embedding_comparison, "threadpool_limits", _record_blas_limits
+        )
+
+        # the batched computation runs in this process and should use the requested number of threads
+        getattr(BatchEmbeddingComparison(random_embeddings), method)(threads=3)
+
+        assert blas_limits == [3]
@@ -6,7 +6,7 @@ import pandas as pd
 import pytest
 import yaml
 
-from pandora.custom_errors import PandoraException
+from pandora.custom_errors import PandoraConfigException, PandoraException
 from pandora.custom_types import EmbeddingAlgorithm
 from pandora.dataset import EigenDataset
 from pandora.embedding import Embedding
@@ -106,8 +106,9 @@ def test_pandora_config_from_configfile(
     pandora_config = pandora_config_from_configfile(pandora_test_config_file)
 
     # manually check some settings to make sure the yaml is correctly parsed into the PandoraConfig
-    assert str(pandora_config.dataset_prefix) == str(
-        pandora_test_config_yaml.get("dataset_prefix")
+    assert (
+        pandora_config.dataset_prefix
+        == pathlib.Path(pandora_test_config_yaml.get("dataset_prefix")).absolute()
     )
     assert pandora_config.n_replicates == pandora_test_config_yaml.get("n_replicates")
     assert pandora_config.threads == pandora_test_config_yaml.get("threads")
@@ -257,6 +258,34 @@ class TestPandora:
         # plot directory should contain six plots (3 pdf, 3 html)
         assert len(list(pandora.pandora_config.plot_dir.iterdir())) == 6
 
+    def test_init_fails_for_unknown_embedding_algorithm(self, pandora_test_config):
+        pandora_test_config.embedding_algorithm = "tsne"
+        with pytest.raises(
+            PandoraConfigException, match="Unrecognized embedding algorithm"
+        ):
+            Pandora(pandora_test_config)
+
+    def test_embed_dataset_fails_for_unknown_embedding_algorithm(
+        self, pandora_test_config
+    ):
+        pandora = Pandora(pandora_test_config)
+        # changing the configuration after initialization should not silently fall back to MDS
+        pandora.pandora_config.embedding_algorithm = "tsne"
+        with pytest.raises(
+            PandoraConfigException, match="Unrecognized embedding algorithm"
+        ):
+            pandora.embed_dataset()
+
+    def test_plot_dataset_fails_for_unknown_embedding_algorithm(
+        self, pandora_test_config
+    ):
+        pandora = Pandora(pandora_test_config)
+        pandora.pandora_config.embedding_algorithm = "tsne"
+        with pytest.raises(
+            PandoraConfigException, match="Unrecognized embedding algorithm"
+        ):
+            pandora._plot_dataset(pandora.dataset, pandora.dataset.name)
+
     def test_plot_dataset_fails_if_pca_is_missing(self, pandora_test_config):
         pandora = Pandora(pandora_test_config)
         with pytest.raises(PandoraException, match="Embedding not yet run for dataset"):
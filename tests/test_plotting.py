@@ -51,6 +51,25 @@ def test_plot_support_values(pca_example):
     plot_support_values(pca_example, support_values)
 
 
+def test_plot_support_values_with_numeric_sample_ids():
+    pca = Embedding(
+        pd.DataFrame(
+            data={
+                "sample_id": [101, 102, 103],
+                "population": ["population1", "population2", "population3"],
+                "D0": [1, 2, 3],
+                "D1": [1, 2, 3],
+            }
+        ),
+        2,
+        np.asarray([0.0, 0.0]),
+    )
+    support_values = pd.Series([0.0, 0.3, 1.0], index=[101, 102, 103])
+
+    fig = plot_support_values(pca, support_values)
+    assert list(fig.data[0].text) == ["0.0<br>(101)", "0.3<br>(102)", ""]
+
+
 def test_plot_support_values_with_different_sample_sets_issues_warnings():
     pca = Embedding(
         pd.DataFrame(